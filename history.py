@@ -0,0 +1,248 @@
+import base64
+import datetime
+import os
+import sqlite3
+
+from github import InputGitAuthor, UnknownObjectException
+
+# Location of the store inside the profile repository and on the runner
+HISTORY_PATH = 'history/stats.sqlite'
+HISTORY_FILE = 'stats.sqlite'
+WAKA_CATEGORIES = ['languages', 'editors', 'projects', 'operating_systems']
+# Every snapshot of the last days is kept, older ones are thinned out to one per month
+KEEP_DAILY_DAYS = 35
+# Snapshots compared week over week may be this many days off, older ones don't count as last week's
+MAX_SNAPSHOT_AGE_DAYS = 3
+# GitHub reports the traffic of the last 14 days only
+TRAFFIC_WINDOW_DAYS = 14
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS waka (
+    date TEXT NOT NULL,
+    category TEXT NOT NULL,
+    name TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (date, category, name)
+);
+CREATE TABLE IF NOT EXISTS waka_weekly (
+    date TEXT NOT NULL,
+    category TEXT NOT NULL,
+    name TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (date, category, name)
+);
+CREATE TABLE IF NOT EXISTS commits (
+    date TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS contributions (
+    year INTEGER PRIMARY KEY,
+    total INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS traffic_views (
+    date TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    uniques INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS traffic_referrers (
+    date TEXT NOT NULL,
+    referrer TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    uniques INTEGER NOT NULL,
+    PRIMARY KEY (date, referrer)
+);
+"""
+
+
+class StatsHistory:
+    """Daily snapshots of the WakaTime and GitHub stats kept in a small SQLite file"""
+
+    def __init__(self, path=HISTORY_FILE, sha=None, read_only=False):
+        self.path = path
+        # Blob sha of the store in the repository, None if there is none yet
+        self.sha = sha
+        self.read_only = read_only
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    @classmethod
+    def pull(cls, repo, path=HISTORY_FILE):
+        """Open the store committed to the profile repository, or a new one on the first run
+
+        If the store can't be read for another reason it's opened empty and read only, so the history in the
+        repository is never overwritten by an empty one.
+        """
+        if os.path.exists(path):
+            os.remove(path)
+        try:
+            contents = repo.get_contents(HISTORY_PATH)
+            # The contents API leaves out files bigger than 1 MB, those are read as blob
+            if contents.encoding == 'base64':
+                data = contents.decoded_content
+            else:
+                data = base64.b64decode(repo.get_git_blob(contents.sha).content)
+            with open(path, 'wb') as output_file:
+                output_file.write(data)
+            return cls(path, sha=contents.sha)
+        except UnknownObjectException:
+            print("No stats history found, starting a new one")
+            return cls(path)
+        except Exception as e:
+            print(f"Cannot read the stats history, it won't be updated this run: {e}")
+            if os.path.exists(path):
+                os.remove(path)
+            return cls(path, read_only=True)
+
+    def push(self, repo):
+        if self.read_only:
+            self.connection.close()
+            return
+        self.prune()
+        self.connection.commit()
+        self.connection.execute('VACUUM')
+        self.connection.close()
+        committer = InputGitAuthor('readme-bot', '41898282+github-actions[bot]@users.noreply.github.com')
+        with open(self.path, 'rb') as input_file:
+            data = input_file.read()
+        if self.sha is None:
+            repo.create_file(HISTORY_PATH, "Stats History Added", data, committer=committer)
+        else:
+            repo.update_file(HISTORY_PATH, "Stats History Updated", data, self.sha, committer=committer)
+
+    def record_waka(self, date: datetime.date, request_data: dict, table='waka'):
+        """Store the totals of the WakaTime stats of the given day, a later run of the same day replaces them
+
+        The 30 days stats go to the waka table, the ones of the last 7 days to waka_weekly.
+        """
+        day = date.isoformat()
+        self.connection.execute(f"DELETE FROM {table} WHERE date = ?", (day,))
+        self.connection.executemany(
+            f"INSERT INTO {table} (date, category, name, seconds) VALUES (?, ?, ?, ?)",
+            [(day, category, entry['name'], entry.get('total_seconds', 0))
+             for category in WAKA_CATEGORIES for entry in request_data['data'].get(category, [])]
+        )
+        self.connection.commit()
+
+    def record_commits(self, date: datetime.date, count: int):
+        """Store the number of commits of the 7 days up to the given day"""
+        self.connection.execute('INSERT OR REPLACE INTO commits (date, count) VALUES (?, ?)', (date.isoformat(), count))
+        self.connection.commit()
+
+    def record_contributions(self, contributions: dict):
+        """Store the contributions of past years, they never change so they are fetched only once"""
+        self.connection.executemany('INSERT OR REPLACE INTO contributions (year, total) VALUES (?, ?)', contributions.items())
+        self.connection.commit()
+
+    def contributions(self):
+        return dict(self.connection.execute('SELECT year, total FROM contributions').fetchall())
+
+    def record_views(self, views: list):
+        """Merge the daily views of the traffic API, only days from the last stored one on are written"""
+        row = self.connection.execute('SELECT MAX(date) FROM traffic_views').fetchone()
+        # The last stored day may have been incomplete when it was fetched, so it is replaced as well
+        since = row[0] or ''
+        self.connection.executemany(
+            'INSERT OR REPLACE INTO traffic_views (date, count, uniques) VALUES (?, ?, ?)',
+            [(view['timestamp'][:10], view['count'], view['uniques']) for view in views if view['timestamp'][:10] >= since]
+        )
+        self.connection.commit()
+
+    def record_referrers(self, date: datetime.date, referrers: list):
+        """Store the referrers of the last 14 days as seen on the given day"""
+        day = date.isoformat()
+        self.connection.execute('DELETE FROM traffic_referrers WHERE date = ?', (day,))
+        self.connection.executemany(
+            'INSERT INTO traffic_referrers (date, referrer, count, uniques) VALUES (?, ?, ?, ?)',
+            [(day, referrer['referrer'], referrer['count'], referrer['uniques']) for referrer in referrers]
+        )
+        self.connection.commit()
+
+    def total_views(self):
+        return self.connection.execute('SELECT COALESCE(SUM(count), 0) FROM traffic_views').fetchone()[0]
+
+    def referrer_windows(self):
+        """Dates of the referrer snapshots at least 14 days apart, starting from the oldest one"""
+        dates = [row[0] for row in self.connection.execute('SELECT DISTINCT date FROM traffic_referrers ORDER BY date')]
+        windows = []
+        for date in dates:
+            if not windows or datetime.date.fromisoformat(date) - datetime.date.fromisoformat(windows[-1]) >= datetime.timedelta(days=TRAFFIC_WINDOW_DAYS):
+                windows.append(date)
+        return windows
+
+    def top_referrers(self):
+        """All time views per referrer, most viewed first
+
+        Every snapshot covers 14 days, so only snapshots at least that far apart are summed up. Views of days
+        between two snapshots taken more than 14 days apart are unknown, and views since the last summed up
+        snapshot are only counted once the next one is 14 days later, which makes the counts a lower bound.
+        """
+        referrers = {}
+        for date in self.referrer_windows():
+            for referrer, count in self.connection.execute('SELECT referrer, count FROM traffic_referrers WHERE date = ?', (date,)):
+                referrers[referrer] = referrers.get(referrer, 0) + count
+        return sorted(referrers.items(), key=lambda x: x[1], reverse=True)
+
+    def prune(self):
+        """Drop the daily snapshots older than KEEP_DAILY_DAYS except the last one of every month
+
+        Weekly WakaTime snapshots are only compared week over week, so none of the old ones is kept.
+        Referrer snapshots which top_referrers never sums up are dropped right away.
+        """
+        limit = (datetime.date.today() - datetime.timedelta(days=KEEP_DAILY_DAYS)).isoformat()
+        self.connection.execute('DELETE FROM waka_weekly WHERE date < ?', (limit,))
+        for table in ['waka', 'commits']:
+            self.connection.execute(f"""
+                DELETE FROM {table} WHERE date < ? AND date NOT IN (
+                    SELECT MAX(date) FROM {table} GROUP BY substr(date, 1, 7)
+                )
+            """, (limit,))
+        windows = self.referrer_windows()
+        self.connection.execute(
+            f"DELETE FROM traffic_referrers WHERE date NOT IN ({', '.join('?' * len(windows))})", windows
+        )
+
+    def snapshot(self, category: str, date: str, table='waka'):
+        rows = self.connection.execute(f"SELECT name, seconds FROM {table} WHERE category = ? AND date = ?", (category, date))
+        return dict(rows.fetchall())
+
+    def latest_date(self, table: str, before: datetime.date):
+        """The last snapshot on or at most MAX_SNAPSHOT_AGE_DAYS before the given day, None if there is none"""
+        after = before - datetime.timedelta(days=MAX_SNAPSHOT_AGE_DAYS)
+        query = f"SELECT MAX(date) FROM {table} WHERE date <= ? AND date >= ?"
+        return self.connection.execute(query, (before.isoformat(), after.isoformat())).fetchone()[0]
+
+    def week_dates(self, table: str, today: datetime.date):
+        """Dates of the current snapshot and the one of a week before, None without snapshots close to both"""
+        current = self.latest_date(table, today)
+        previous = self.latest_date(table, today - datetime.timedelta(days=7))
+        if current is None or previous is None:
+            return None
+        return current, previous
+
+    def weekly_delta(self, category: str, today: datetime.date):
+        """Compare the totals of the last 7 days with the ones of the week before, None without enough history"""
+        dates = self.week_dates('waka_weekly', today)
+        if dates is None:
+            return None
+        current, previous = dates
+        current_data = self.snapshot(category, current, 'waka_weekly')
+        previous_data = self.snapshot(category, previous, 'waka_weekly')
+        delta = [{'name': name, 'seconds': seconds, 'delta': seconds - previous_data.get(name, 0)}
+                 for name, seconds in current_data.items()]
+        return sorted(delta, key=lambda x: x['seconds'], reverse=True)
+
+    def commits_delta(self, today: datetime.date):
+        """Change of the weekly commits compared to the week before, None without enough history"""
+        dates = self.week_dates('commits', today)
+        if dates is None:
+            return None
+        current, previous = dates
+        query = 'SELECT count FROM commits WHERE date = ?'
+        return self.connection.execute(query, (current,)).fetchone()[0] - self.connection.execute(query, (previous,)).fetchone()[0]
+
+    def monthly_evolution(self, category: str, months=12):
+        """The last snapshot of every month (its 30 days totals), oldest month first"""
+        rows = self.connection.execute("""
+            SELECT MAX(date) FROM waka WHERE category = ? GROUP BY substr(date, 1, 7) ORDER BY 1 DESC LIMIT ?
+        """, (category, months)).fetchall()
+        return [(date, self.snapshot(category, date)) for date, in reversed(rows)]
@@ -5,35 +5,119 @@ import requests
 from github import Github, InputGitAuthor
 import datetime
 from string import Template
-import matplotlib.pyplot as plt
 from io import StringIO, BytesIO
 from dotenv import load_dotenv
+import itertools
 import time
+import shelve
+import shutil
+import tempfile
+from array import array
+
+# Languages kept in the in-memory counters, the rest is spilled to disk
+MAX_LANGUAGES_IN_MEMORY = 32
+# Every commit of the user costs one request plus one per page of commits, GitHub allows 5000 requests per hour
+COMMITS_PER_PAGE = 100
+# Commits counted in a repository before moving on to the next one, so a run stopped by the rate limit
+# still samples every repository instead of only the oldest ones
+COMMITS_PER_ROUND = 30
+
+
+class RateLimitExceeded(Exception):
+    pass
+
+
+class LocCounter:
+    """Year x quarter x language counters of written lines of code with a fixed memory footprint"""
+
+    def __init__(self, max_languages=MAX_LANGUAGES_IN_MEMORY):
+        self.max_languages = max_languages
+        self.languages = []
+        self.language_index = {}
+        self.years = {}
+        self.spill_dir = None
+        self.spill = None
+
+    def add(self, year, quarter, language, lines):
+        if language not in self.language_index:
+            self.language_index[language] = len(self.languages)
+            self.languages.append(language)
+        index = self.language_index[language]
+        if index < self.max_languages:
+            if year not in self.years:
+                self.years[year] = array('q', [0] * (4 * self.max_languages))
+            self.years[year][(quarter - 1) * self.max_languages + index] += lines
+        else:
+            if self.spill is None:
+                self.spill_dir = tempfile.mkdtemp(prefix='loc_')
+                self.spill = shelve.open(os.path.join(self.spill_dir, 'counters'))
+            key = f"{year}:{quarter}:{index}"
+            self.spill[key] = self.spill.get(key, 0) + lines
+
+    def items(self):
+        """Yield (year, quarter, language, lines) for every non-zero counter"""
+        for year in sorted(self.years):
+            counters = self.years[year]
+            for position, lines in enumerate(counters):
+                if lines != 0:
+                    yield year, position // self.max_languages + 1, self.languages[position % self.max_languages], lines
+        if self.spill is not None:
+            for key in sorted(self.spill.keys()):
+                year, quarter, index = (int(part) for part in key.split(':'))
+                if self.spill[key] != 0:
+                    yield year, quarter, self.languages[index], self.spill[key]
+
+    def total(self):
+        return sum(lines for _, _, _, lines in self.items())
+
+    def to_yearly_data(self):
+        """Nested {year: {quarter: {language: lines}}} dict as consumed by BarGraph"""
+        yearly_data = {}
+        for year, quarter, language, lines in self.items():
+            yearly_data.setdefault(year, {}).setdefault(quarter, {})[language] = lines
+        return {year: yearly_data[year] for year in sorted(yearly_data)}
 
-from make_bar_graph import BarGraph
+    def close(self):
+        if self.spill is not None:
+            self.spill.close()
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill = None
 
 
 class LinesOfCode:
 
-    def __init__(self, id, username, ghtoken, repositoryData, ignored_repos):
+    def __init__(self, id, username, ghtoken, repositoryData, ignored_repos, api_url='https://api.github.com'):
         self.id = id
         self.username = username
+        self.api_url = api_url
 
-        self.g = Github(ghtoken)
+        self.g = Github(ghtoken, base_url=api_url)
         self.headers = {"Authorization": "Bearer " + ghtoken}
         self.repositoryData = repositoryData
         self.ignored_repos = ignored_repos
 
     def calculateLoc(self):
         result = self.repositoryData
-        yearly_data = {}
-        for repo in result['data']['user']['repositories']['edges']:
-            if repo['node']['name'] not in self.ignored_repos:
-                self.getCommitStat(repo['node'], yearly_data)
-                time.sleep(0.7)
-        return yearly_data
+        counter = LocCounter()
+        walks = [self.getCommitStat(repo['node'], counter) for repo in result['data']['user']['repositories']['edges']
+                 if repo['node']['name'] not in self.ignored_repos]
+        try:
+            try:
+                # Round robin over the repositories until all of their commits are counted
+                while walks:
+                    for walk in list(walks):
+                        if sum(1 for _ in itertools.islice(walk, COMMITS_PER_ROUND)) < COMMITS_PER_ROUND:
+                            walks.remove(walk)
+                        time.sleep(0.7)
+            except RateLimitExceeded as e:
+                print(f"{e}, the lines of code only include the commits counted so far")
+            return counter.to_yearly_data()
+        finally:
+            counter.close()
 
     def plotLoc(self, yearly_data):
+        # The charting dependencies are only needed for the chart, counting works without them
+        from make_bar_graph import BarGraph
         graph = BarGraph(yearly_data)
         graph.build_graph()
         self.pushChart()
@@ -43,6 +127,8 @@ class LinesOfCode:
         request = requests.get(endPoint, headers=self.headers)
         if request.status_code == 401:
             raise Exception("Invalid token {}.".format(request.status_code))
+        elif request.status_code in [403, 429] and request.headers.get('X-RateLimit-Remaining') == '0':
+            raise RateLimitExceeded("GitHub API rate limit exceeded")
         elif request.status_code == 204:
             return []
         else:
@@ -59,42 +145,41 @@ class LinesOfCode:
         elif month >= 10 and month <= 12:
             return 4
 
-    def getCommitStat(self, repoDetails, yearly_data):
-        commitsURL = 'https://api.github.com/repos/' + repoDetails['nameWithOwner'] + '/commits'
-        filteredCommitsEndPoint = commitsURL + '?author=' + self.username
-        filteredCommitsResult = self.run_query_v3(filteredCommitsEndPoint)
-        # This ignores the error message you get when you try to list commits for an empty repository
-        if not type(filteredCommitsResult) == list:
+    def iterCommits(self, commitsURL):
+        """Yield the commits of the user page by page, so a repository is never held in memory as a whole"""
+        page = 1
+        while True:
+            filteredCommitsEndPoint = f"{commitsURL}?author={self.username}&per_page={COMMITS_PER_PAGE}&page={page}"
+            filteredCommitsResult = self.run_query_v3(filteredCommitsEndPoint)
+            # This ignores the error message you get when you try to list commits for an empty repository
+            if not type(filteredCommitsResult) == list:
+                return
+            yield from filteredCommitsResult
+            if len(filteredCommitsResult) < COMMITS_PER_PAGE:
+                return
+            page += 1
+
+    def getCommitStat(self, repoDetails, counter):
+        """Count the commits of the repository, yields after every commit fetched so repositories can take turns"""
+        # Commits of repositories without a language are never counted, so don't fetch them at all
+        if repoDetails['primaryLanguage'] is None:
             return
-        this_year = datetime.datetime.utcnow().year
+        language = repoDetails['primaryLanguage']['name']
+        commitsURL = self.api_url + '/repos/' + repoDetails['nameWithOwner'] + '/commits'
 
-        for i in range(len(filteredCommitsResult)):
-            iso_date = filteredCommitsResult[i]["commit"]["author"]["date"]
+        for commit in self.iterCommits(commitsURL):
+            iso_date = commit["commit"]["author"]["date"]
             date = re.search(r'\d+-\d+-\d+', iso_date).group(0)
             curr_year = datetime.datetime.fromisoformat(date).year
-            # if  curr_year != this_year:
 
-            individualCommitEndPoint = commitsURL + '/' + filteredCommitsResult[i]["sha"]
+            individualCommitEndPoint = commitsURL + '/' + commit["sha"]
             individualCommitResult = self.run_query_v3(individualCommitEndPoint)
-
-            quarter = self.getQuarter(date)
-            if repoDetails['primaryLanguage'] is not None:
-
-                if curr_year not in yearly_data:
-                    yearly_data[curr_year] = {}
-                if quarter not in yearly_data[curr_year]:
-                    yearly_data[curr_year][quarter] = {}
-                if repoDetails['primaryLanguage']['name'] not in yearly_data[curr_year][quarter]:
-                    yearly_data[curr_year][quarter][repoDetails['primaryLanguage']['name']] = 0
-                yearly_data[curr_year][quarter][repoDetails['primaryLanguage']['name']] += (individualCommitResult["stats"]["additions"] - individualCommitResult["stats"]['deletions'])
-
-                # to find total
-
-                # if 'total' not in yearly_data[curr_year]:
-                #   yearly_data[curr_year]['total']={}
-                # if repoDetails['primaryLanguage']['name'] not in yearly_data[curr_year]['total']:
-                #   yearly_data[curr_year]['total'][repoDetails['primaryLanguage']['name']]=0
-                # yearly_data[curr_year]['total'][repoDetails['primaryLanguage']['name']]+=(result[i][1]+result[i][2])
+            # Commits which can't be fetched anymore answer with an error message instead
+            if "stats" in individualCommitResult:
+                quarter = self.getQuarter(date)
+                counter.add(curr_year, quarter, language,
+                            individualCommitResult["stats"]["additions"] - individualCommitResult["stats"]['deletions'])
+            yield
 
     def pushChart(self):
         repo = self.g.get_repo(f"{self.username}/{self.username}")
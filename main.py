@@ -7,6 +7,7 @@ import json
 import os
 import re
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from string import Template
 from urllib.parse import quote
 
@@ -18,6 +19,9 @@ from dotenv import load_dotenv
 from github import Github, InputGitAuthor
 from pytz import timezone
 
+from history import StatsHistory
+from make_text_table import TextTable, fit
+
 load_dotenv()
 
 START_COMMENT = '<!--START_SECTION:waka-->'
@@ -26,6 +30,7 @@ listReg = f"{START_COMMENT}[\\s\\S]+{END_COMMENT}"
 
 waka_key = os.getenv('INPUT_WAKATIME_API_KEY')
 waka_url = os.getenv('INPUT_WAKATIME_URL')
+github_api_url = (os.getenv('INPUT_GITHUB_API_URL') or 'https://api.github.com').rstrip('/')
 githubToken = os.getenv('INPUT_GH_TOKEN')
 showTimeZone = os.getenv('INPUT_SHOW_TIMEZONE')
 showProjects = os.getenv('INPUT_SHOW_PROJECTS')
@@ -38,6 +43,7 @@ show_days_of_week = os.getenv('INPUT_SHOW_DAYS_OF_WEEK')
 showLanguagePerRepo = os.getenv('INPUT_SHOW_LANGUAGE_PER_REPO')
 showLocChart = os.getenv('INPUT_SHOW_LOC_CHART')
 show_profile_view = os.getenv('INPUT_SHOW_PROFILE_VIEWS')
+show_profile_referrers = os.getenv('INPUT_SHOW_PROFILE_REFERRERS')
 show_short_info = os.getenv('INPUT_SHOW_SHORT_INFO')
 locale = os.getenv('INPUT_LOCALE')
 commit_by_me = os.getenv('INPUT_COMMIT_BY_ME')
@@ -45,6 +51,9 @@ ignored_repos_name = str(os.getenv('INPUT_IGNORED_REPOS') or '').replace(' ', ''
 show_updated_date = os.getenv('INPUT_SHOW_UPDATED_DATE')
 commit_message = os.getenv('INPUT_COMMIT_MESSAGE')
 show_total_code_time = os.getenv('INPUT_SHOW_TOTAL_CODE_TIME')
+show_history = os.getenv('INPUT_SHOW_HISTORY')
+fractional_bars = os.getenv('INPUT_FRACTIONAL_BARS')
+history = None
 show_waka_stats = 'y'
 # The GraphQL query to get commit data.
 userInfoQuery = """
@@ -94,14 +103,41 @@ query {
 }
 """)
 
+contributionsQuery = Template("""
+# noinspection GraphQLUnresolvedReference
+query {
+    user(login: "$username") {
+        contributionsCollection {
+            contributionYears
+        }
+        contributions: contributionsCollection(from: "${year}-01-01T00:00:00Z", to: "${year}-12-31T23:59:59Z") {
+            contributionCalendar {
+                totalContributions
+            }
+        }
+    }
+}
+""")
+
+weeklyCommitsQuery = Template("""
+# noinspection GraphQLUnresolvedReference
+query {
+    user(login: "$username") {
+        contributionsCollection(from: "$since", to: "$until") {
+            totalCommitContributions
+        }
+    }
+}
+""")
+
 get_loc_url = Template("""/repos/$owner/$repo/stats/code_frequency""")
-get_profile_view = Template("""/repos/$owner/$repo/traffic/views?per=week""")
+get_profile_view = Template("""/repos/$owner/$repo/traffic/views?per=day""")
 get_profile_traffic = Template("""/repos/$owner/$repo/traffic/popular/referrers""")
 truthy = ['true', '1', 't', 'y', 'yes']
 
 
 def run_v3_api(query):
-    request = requests.get('https://api.github.com' + query, headers=headers)
+    request = requests.get(github_api_url + query, headers=headers)
     if request.status_code == 200:
         return request.json()
     else:
@@ -176,50 +212,43 @@ def millify(n):
 
 
 def run_query(query):
-    request = requests.post('https://api.github.com/graphql', json={'query': query}, headers=headers)
+    request = requests.post(github_api_url + '/graphql', json={'query': query}, headers=headers)
     if request.status_code == 200:
         return request.json()
     else:
         raise Exception("Query failed to run by returning code of {}. {}".format(request.status_code, query))
 
 
-def make_graph(percent: float):
-    """Make progress graph from API graph"""
-    done_block = '█'
-    empty_block = '░'
-    return f"{done_block * math.floor(percent / 4)}{empty_block * (25 - math.floor(percent / 4))}"
-
-
-def make_list(commit_data: list):
+def make_list(commit_data: list, limit=5):
     """Make List"""
-    data_list = []
-    for l in commit_data[:5]:
-        ln = len(l['name'])
-        ln_text = len(l['text'])
-        op = f"{l['name'][:25]}{' ' * (25 - ln)}{l['text']}{' ' * (20 - ln_text)}{make_graph(l['percent'])}   {l['percent']}%"
-        data_list.append(op)
-    return ' \n'.join(data_list)
+    return TextTable(25, 20, fractional_bars.lower() in truthy).render(commit_data[:limit])
 
 
 def make_commit_list(commit_data: list):
     """Make List"""
+    return TextTable(13, 15, fractional_bars.lower() in truthy).render(commit_data[:7])
+
+
+def format_seconds(seconds: float):
+    """Format a duration the way WakaTime does"""
+    minutes = int(abs(seconds)) // 60
+    return f"{minutes // 60} hrs {minutes % 60} mins"
+
+
+def make_delta_list(delta_data: list):
+    """Make List of the time spent with the change since last week"""
     data_list = []
-    for l in commit_data[:7]:
-        ln = len(l['name'])
-        ln_text = len(l['text'])
-        op = f"{l['name']}{' ' * (13 - ln)}{l['text']}{' ' * (15 - ln_text)}{make_graph(l['percent'])}   {l['percent']}%"
+    for l in delta_data[:5]:
+        sign = '+' if l['delta'] >= 0 else '-'
+        op = f"{fit(l['name'], 25)}{fit(format_seconds(l['seconds']), 20)}{sign}{format_seconds(l['delta'])}"
         data_list.append(op)
     return ' \n'.join(data_list)
 
 
 def generate_commit_list(tz):
     string = ''
-    result = run_query(userInfoQuery)  # Execute the query
-    commit_user_username = result["data"]["viewer"]["login"]
-    commit_user_id = result["data"]["viewer"]["id"]
-    # print("user {}".format(username))
-
-    result = run_query(createContributedRepoQuery.substitute(username=commit_user_username))
+    # The user is already known from the authentication, so it isn't queried again
+    result = run_query(createContributedRepoQuery.substitute(username=username))
     nodes = result["data"]["user"]["repositoriesContributedTo"]["nodes"]
     repos = [d for d in nodes if d['isFork'] is False]
 
@@ -238,7 +267,7 @@ def generate_commit_list(tz):
 
     for repository in repos:
         result = run_query(
-            createCommittedDateQuery.substitute(owner=repository["owner"]["login"], name=repository["name"], id=commit_user_id))
+            createCommittedDateQuery.substitute(owner=repository["owner"]["login"], name=repository["name"], id=user_id))
         try:
             committed_dates = result["data"]["repository"]["defaultBranchRef"]["target"]["history"]["edges"]
             for committedDate in committed_dates:
@@ -320,21 +349,37 @@ def generate_commit_list(tz):
     return string
 
 
-def get_waka_time_stats():
+def waka_api_url(endpoint: str):
+    """Build a WakaTime API url, the configured url may omit the scheme"""
+    base_url = waka_url if re.match(r'^https?://', waka_url) else f"https://{waka_url}"
+    return f"{base_url.rstrip('/')}/v1/{endpoint}?api_key={waka_key}"
+
+
+def get_waka_stats(github):
+    return requests.get(waka_api_url('users/current/stats/last_30_days'))
+
+
+def get_waka_weekly_stats(github):
+    return requests.get(waka_api_url('users/current/stats/last_7_days'))
+
+
+def get_waka_user(github):
+    return requests.get(waka_api_url('users/current'))
+
+
+def get_waka_time_stats(github, data):
     stats = ''
-    request = requests.get(
-        f"https://{waka_url}/v1/users/current/stats/last_30_days?api_key={waka_key}")
-    current_user_request = requests.get(
-        f"https://{waka_url}/v1/users/current?api_key={waka_key}"
-    )
+    request = data['waka_stats']
     no_activity = translate["No Activity Tracked This Week"]
 
-    if request.status_code == 401:
-        print("Error With WAKA time API returned " + str(request.status_code) + " Response " + str(request.json()))
+    # WakaTime answers 202 while the stats are still being computed, there is nothing to show then
+    if request.status_code != 200:
+        print("Error With WAKA time API returned " + str(request.status_code) + " Response " + request.text)
     else:
         empty = True
         request_data = request.json()
-        current_user_data = current_user_request.json()
+        # Only required by the commit list and the timezone
+        current_user_data = data['waka_user'].json() if 'waka_user' in data else None
         if showCommit.lower() in truthy:
             empty = False
             stats = stats + generate_commit_list(tz=current_user_data['data']['timezone']) + '\n\n'
@@ -386,10 +431,89 @@ def get_waka_time_stats():
     return stats
 
 
-def generate_language_per_repo(result):
+def get_weekly_commits():
+    """Commits of the user in the last 7 days, None if they can't be fetched"""
+    until = datetime.datetime.utcnow()
+    since = until - datetime.timedelta(days=7)
+    try:
+        result = run_query(weeklyCommitsQuery.substitute(username=username, since=since.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                                                         until=until.strftime('%Y-%m-%dT%H:%M:%SZ')))
+        return result['data']['user']['contributionsCollection']['totalCommitContributions']
+    except Exception as e:
+        print("Cannot fetch the commits of the last week " + str(e))
+        return None
+
+
+def generate_history_stats(github, data):
+    """Trends computed from the stats history, sections without enough history yet are left out"""
+    string = ''
+    today = datetime.date.today()
+    if data['waka_stats'].status_code == 200:
+        history.record_waka(today, data['waka_stats'].json())
+    if data['waka_weekly_stats'].status_code == 200:
+        history.record_waka(today, data['waka_weekly_stats'].json(), 'waka_weekly')
+    weekly_commits = data['weekly_commits']
+    if weekly_commits is not None:
+        history.record_commits(today, weekly_commits)
+    language_delta = history.weekly_delta('languages', today)
+    if language_delta:
+        string += '**' + translate['Compared To Last Week'] + '** \n\n'
+        string += '```text\n' + translate['Languages'] + ': \n' + make_delta_list(language_delta) + '\n\n'
+        commits_delta = history.commits_delta(today)
+        if weekly_commits is not None:
+            string += translate['Commits'] + ': ' + str(weekly_commits)
+            if commits_delta is not None:
+                string += ' (' + ('+' if commits_delta >= 0 else '') + str(commits_delta) + ')'
+            string += '\n\n'
+        string += '```\n\n'
+
+    evolution = []
+    for date, languages in history.monthly_evolution('languages'):
+        if len(languages) == 0:
+            continue
+        top_language = max(languages, key=languages.get)
+        evolution.append({
+            "name": datetime.date.fromisoformat(date).strftime('%b %Y'),
+            "text": top_language,
+            "percent": round(languages[top_language] / sum(languages.values()) * 100, 2)
+        })
+    if len(evolution) > 1:
+        string += '**' + translate['Language Evolution'] + '** \n\n'
+        string += '```text\n' + make_list(evolution, limit=12) + '\n\n```\n\n'
+    return string
+
+
+def get_profile_referrer_data(github):
+    return run_v3_api(get_profile_traffic.substitute(owner=username, repo=username))
+
+
+def generate_profile_referrers(github, data):
+    """Table of the sites referring to the profile, all time with the stats history or else of the last 14 days"""
+    referrers = data['profile_referrers']
+    if history is not None:
+        history.record_referrers(datetime.date.today(), referrers)
+        referrer_count = history.top_referrers()
+    else:
+        referrer_count = [(referrer['referrer'], referrer['count']) for referrer in referrers]
+    total = sum(count for _, count in referrer_count)
+    if total == 0:
+        return ''
+    referrer_data = [{
+        "name": referrer,
+        "text": str(count) + (" view" if count == 1 else " views"),
+        "percent": round(count / total * 100, 2)
+    } for referrer, count in referrer_count]
+    return '**' + translate['Top Referrers'] + '** \n\n' + '```text\n' + make_list(referrer_data) + '\n\n```\n\n'
+
+
+def get_repository_list(github):
+    return run_query(repositoryListQuery.substitute(username=username, id=user_id))
+
+
+def generate_language_per_repo(github, data):
     language_count = {}
     total = 0
-    for repo_result in result['data']['user']['repositories']['edges']:
+    for repo_result in data['repositories']['data']['user']['repositories']['edges']:
         if repo_result['node']['primaryLanguage'] is None:
             continue
         language = repo_result['node']['primaryLanguage']['name']
@@ -417,12 +541,12 @@ def generate_language_per_repo(result):
         })
 
     title = translate['I Mostly Code in'] % most_language_repo
-    return '**' + title + '** \n\n' + '```text\n' + make_list(language_data) + '\n\n```\n'
+    return '**' + title + '** \n\n' + '```text\n' + make_list(language_data) + '\n\n```\n' + '\n\n'
 
 
 # def get_yearly_data():
 #     repository_list = run_query(repositoryListQuery.substitute(username=username, id=user_id))
-#     loc = LinesOfCode(user_id, username, githubToken, repository_list, ignored_repos_name)
+#     loc = LinesOfCode(user_id, username, githubToken, repository_list, ignored_repos_name, github_api_url)
 #     yearly_data = loc.calculateLoc()
 #     if showLocChart.lower() in truthy:
 #         loc.plotLoc(yearly_data)
@@ -431,7 +555,7 @@ def generate_language_per_repo(result):
 
 # def get_line_of_code():
 #     repository_list = run_query(repositoryListQuery.substitute(username=username, id=user_id))
-#     loc = LinesOfCode(user_id, username, githubToken, repository_list, ignored_repos_name)
+#     loc = LinesOfCode(user_id, username, githubToken, repository_list, ignored_repos_name, github_api_url)
 #     yearly_data = loc.calculateLoc()
 #     total_loc = sum(
 #         [yearly_data[year][quarter][lang] for year in yearly_data for quarter in yearly_data[year] for lang in
@@ -439,20 +563,59 @@ def generate_language_per_repo(result):
 #     return millify(int(total_loc))
 
 
-def get_short_info(github):
+def get_year_contributions(year: int):
+    """Returns the contribution years of the user and the total contributions of the given year, None on failure"""
+    try:
+        result = run_query(contributionsQuery.substitute(username=username, year=year))
+        user = result['data']['user']
+        return user['contributionsCollection']['contributionYears'], user['contributions']['contributionCalendar']['totalContributions']
+    except Exception as e:
+        print(f"Cannot fetch the contributions of {year} " + str(e))
+        return None
+
+
+def get_contributions():
+    """Contributions per year, past years can't change anymore so they are cached in the stats history
+
+    Years which can't be fetched are left out, the second value tells whether all years are there.
+    """
+    this_year = datetime.datetime.utcnow().year
+    result = get_year_contributions(this_year)
+    if result is None:
+        return {}, False
+    years, total = result
+    contributions = {this_year: total}
+    if history is None:
+        return contributions, len(years) <= 1
+    cached = history.contributions()
+    missing = [year for year in years if year != this_year and year not in cached]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        fetched = {year: result[1] for year, result in zip(missing, executor.map(get_year_contributions, missing)) if result is not None}
+    history.record_contributions(fetched)
+    contributions.update({year: cached[year] for year in years if year in cached})
+    contributions.update(fetched)
+    return contributions, len(contributions) == len(set(years) | {this_year})
+
+
+def get_github_user(github):
+    return github.get_user()
+
+
+def get_short_info(github, data):
     string = '**' + translate['My GitHub Data'] + '**\n\n'
-    user_info = github.get_user()
+    user_info = data['github_user']
     if user_info.disk_usage is None:
         disk_usage = humanize.naturalsize(0)
         print("Please add new GitHub personal access token with user permission")
     else:
         disk_usage = humanize.naturalsize(user_info.disk_usage)
-    request = requests.get('https://github-contributions.now.sh/api/v1/' + user_info.login)
-    if request.status_code == 200:
-        request_data = request.json()
-        total = request_data['years'][0]['total']
-        year = request_data['years'][0]['year']
-        string += f"> {translate['Contributions in the year'] % (humanize.intcomma(total), year)}\n> \n"
+    contributions, complete = data['contributions']
+    year = datetime.datetime.utcnow().year
+    if year in contributions:
+        string += f"> {translate['Contributions in the year'] % (humanize.intcomma(contributions[year]), year)}\n> \n"
+    if complete and len(contributions) > 1:
+        total = sum(contributions.values())
+        string += f"> {translate['Contributions since'] % (humanize.intcomma(total), min(contributions))}\n> \n"
 
     string += f"> {translate['Used in GitHubs Storage'] % disk_usage}\n> \n"
     is_hireable = user_info.hireable
@@ -475,59 +638,79 @@ def get_short_info(github):
     return string
 
 
-def get_stats(github):
-    """Gets API data and returns markdown progress"""
+def get_profile_view_data(github):
+    return run_v3_api(get_profile_view.substitute(owner=username, repo=username))
 
-    stats = ''
-    repository_list = run_query(repositoryListQuery.substitute(username=username, id=user_id))
-
-    # if show_loc.lower() in truthy or showLocChart.lower() in truthy:
-    #     # This condition is written to calculate the lines of code because it is heavy process soo needs to be calculate once this will
-    #     # reduce the execution time
-    #     yearly_data = get_yearly_data()
-
-    # if show_total_code_time.lower() in truthy:
-    #     request = requests.get(
-    #         f"https://{waka_url}/v1/users/current/all_time_since_today?api_key={waka_key}")
-    #     if request.status_code == 401:
-    #         print("Error With WAKA time API returned " + str(request.status_code) + " Response " + str(request.json()))
-    #     elif "text" not in request.json()["data"]:
-    #         print("User stats are calculating. Try again later.")
-    #     else:
-    #         request_data = request.json()
-    #         stats += '![Code Time](https://img.shields.io/badge/' + quote(str("Code Time")) + '-' + quote(str(request_data['data']['text'])) \
-    #                  + '-blue?style=for-the-badge)\n\n'
-
-    if show_profile_view.lower() in truthy:
-        request_data = run_v3_api(get_profile_view.substitute(owner=username, repo=username))
-        stats += '![Profile Views](https://img.shields.io/badge/' + quote(str(translate['Profile Views'])) + '-' + str(
-            request_data['count']) + '-blue?style=for-the-badge)\n\n'
-
-    # if show_loc.lower() in truthy:
-    #     stats += '![Lines of code](https://img.shields.io/badge/' + quote(
-    #         str(translate['From Hello World I have written'])) + '-' + quote(
-    #         str(get_line_of_code())) + '%20' + quote(str(translate['Lines of code'])) + '-blue?style=for-the-badge)\n\n'
-
-    if show_short_info.lower() in truthy:
-        stats += get_short_info(github)
-
-    if show_waka_stats.lower() in truthy:
-        stats += get_waka_time_stats()
-
-    if showLanguagePerRepo.lower() in truthy:
-        stats = stats + generate_language_per_repo(repository_list) + '\n\n'
-
-    if showLocChart.lower() in truthy:
-        stats += '**' + translate['Timeline'] + '**\n\n'
-        branch_name = github.get_repo(f'{username}/{username}').default_branch
-        stats += f"![Chart not found](https://raw.githubusercontent.com/{username}/{username}/{branch_name}/charts/bar_graph.png)\n\n"
-
-    if show_updated_date.lower() in truthy:
-        now = datetime.datetime.utcnow()
-        d1 = now.strftime("%d/%m/%Y %H:%M:%S")
-        stats = stats + "\n Last Updated on " + d1 + " UTC"
 
-    return stats
+def get_profile_views(github, data):
+    request_data = data['profile_views']
+    # GitHub only keeps 14 days of traffic, the history accumulates them into an all time count
+    if history is not None:
+        history.record_views(request_data['views'])
+        profile_views = history.total_views()
+    else:
+        profile_views = request_data['count']
+    return '![Profile Views](https://img.shields.io/badge/' + quote(str(translate['Profile Views'])) + '-' + str(
+        profile_views) + '-blue?style=for-the-badge)\n\n'
+
+
+def get_profile_repo(github):
+    return github.get_repo(f'{username}/{username}')
+
+
+def get_loc_chart(github, data):
+    branch_name = data['profile_repo'].default_branch
+    return '**' + translate['Timeline'] + '**\n\n' + \
+        f"![Chart not found](https://raw.githubusercontent.com/{username}/{username}/{branch_name}/charts/bar_graph.png)\n\n"
+
+
+def get_updated_date(github, data):
+    now = datetime.datetime.utcnow()
+    d1 = now.strftime("%d/%m/%Y %H:%M:%S")
+    return "\n Last Updated on " + d1 + " UTC"
+
+
+# Data the sections depend on, fetched once if any enabled section requires it
+data_providers = {
+    'profile_views': get_profile_view_data,
+    'profile_referrers': get_profile_referrer_data,
+    'profile_repo': get_profile_repo,
+    'github_user': get_github_user,
+    'contributions': lambda github: get_contributions(),
+    'weekly_commits': lambda github: get_weekly_commits(),
+    'repositories': get_repository_list,
+    'waka_stats': get_waka_stats,
+    'waka_weekly_stats': get_waka_weekly_stats,
+    'waka_user': get_waka_user,
+}
+
+# Sections in the order they are rendered, each one declares the data it requires with a function returning their names
+sections = [
+    {'enabled': lambda: show_profile_view.lower() in truthy, 'requires': lambda: ['profile_views'], 'render': get_profile_views},
+    {'enabled': lambda: show_short_info.lower() in truthy, 'requires': lambda: ['github_user', 'contributions'], 'render': get_short_info},
+    {
+        'enabled': lambda: show_waka_stats.lower() in truthy and any(
+            flag.lower() in truthy for flag in [showCommit, showTimeZone, showLanguage, showEditors, showProjects, showOs]),
+        'requires': lambda: ['waka_stats'] + (['waka_user'] if showCommit.lower() in truthy or showTimeZone.lower() in truthy else []),
+        'render': get_waka_time_stats
+    },
+    {'enabled': lambda: show_history.lower() in truthy, 'requires': lambda: ['waka_stats', 'waka_weekly_stats', 'weekly_commits'],
+     'render': generate_history_stats},
+    {'enabled': lambda: show_profile_referrers.lower() in truthy, 'requires': lambda: ['profile_referrers'],
+     'render': generate_profile_referrers},
+    {'enabled': lambda: showLanguagePerRepo.lower() in truthy, 'requires': lambda: ['repositories'], 'render': generate_language_per_repo},
+    {'enabled': lambda: showLocChart.lower() in truthy, 'requires': lambda: ['profile_repo'], 'render': get_loc_chart},
+    {'enabled': lambda: show_updated_date.lower() in truthy, 'requires': lambda: [], 'render': get_updated_date},
+]
+
+
+def get_stats(github):
+    """Gets API data and returns markdown progress"""
+    enabled_sections = [section for section in sections if section['enabled']()]
+    required = {name for section in enabled_sections for name in section['requires']()}
+    # Only the data some enabled section depends on is fetched
+    data = {name: provider(github) for name, provider in data_providers.items() if name in required}
+    return ''.join(section['render'](github, data) for section in enabled_sections)
 
 
 # def star_me():
@@ -547,11 +730,11 @@ def generate_new_readme(stats: str, old_readme: str):
 
 if __name__ == '__main__':
     try:
-        print(f"Fetching wakatime data from https://{waka_url}/v1/users/current/stats/last_30_days?api_key={waka_key}")
+        print(f"Fetching wakatime data from {waka_api_url('users/current/stats/last_30_days')}")
         start_time = datetime.datetime.now().timestamp() * 1000
         if githubToken is None:
             raise Exception('Token not available')
-        g = Github(githubToken)
+        g = Github(githubToken, base_url=github_api_url)
         headers = {"Authorization": "Bearer " + githubToken}
         user_data = run_query(userInfoQuery)  # Execute the query
         username = user_data["data"]["viewer"]["login"]
@@ -564,10 +747,13 @@ if __name__ == '__main__':
         try:
             with open(os.path.join(os.path.dirname(__file__), 'translation.json'), encoding='utf-8') as config_file:
                 data = json.load(config_file)
-            translate = data[locale]
+            # Keys missing in a locale fall back to english
+            translate = {**data['en'], **data[locale]}
         except Exception as e:
             print("Cannot find the Locale choosing default to english")
             translate = data['en']
+        if show_history.lower() in truthy:
+            history = StatsHistory.pull(repo)
         waka_stats = get_stats(g)
         # star_me()
         readme = decode_readme(contents.content)
@@ -586,6 +772,8 @@ if __name__ == '__main__':
                                  content=new_readme, sha=contents.sha, branch='main',
                                  committer=committer)
             print("Readme updated")
+        if history is not None:
+            history.push(repo)
         end_time = datetime.datetime.now().timestamp() * 1000
         print("Program processed in {} miliseconds.".format(round(end_time - start_time, 0)))
     except Exception as e:
@@ -18,18 +18,19 @@ class BarGraph:
             colors = json.load(f)
         allColorsValues = []
 
-        # filter data
+        # filter data, the top languages are kept aside so yearly_data is never mutated
         max_languages = 5
         top_languages = {}
+        top = {}
         for year in self.yearly_data.keys():
+            top[year] = {}
             for quarter in self.yearly_data[year].keys():
+                top[year][quarter] = {}
                 for language in sorted(list(self.yearly_data[year][quarter].keys()),
                                        key=lambda lang: self.yearly_data[year][quarter][lang], reverse=True)[
                                 0:max_languages]:
-                    if 'top' not in self.yearly_data[year][quarter]:
-                        self.yearly_data[year][quarter]['top'] = {}
                     if self.yearly_data[year][quarter][language] != 0:
-                        self.yearly_data[year][quarter]['top'][language] = self.yearly_data[year][quarter][language]
+                        top[year][quarter][language] = self.yearly_data[year][quarter][language]
 
                         if language not in top_languages:
                             top_languages[language] = 1
@@ -49,11 +50,8 @@ class BarGraph:
             language_year = []
             for year in self.yearly_data.keys():
                 language_quarter = [0, 0, 0, 0]
-                for quarter in self.yearly_data[year].keys():
-                    if language in self.yearly_data[year][quarter]['top']:
-                        language_quarter[quarter - 1] = self.yearly_data[year][quarter]['top'][language]
-                    else:
-                        language_quarter[quarter - 1] = 0
+                for quarter in top[year].keys():
+                    language_quarter[quarter - 1] = top[year][quarter].get(language, 0)
                 language_year.append(language_quarter)
             languages_all_loc[language] = language_year
 
@@ -0,0 +1,68 @@
+import math
+import unicodedata
+
+BAR_WIDTH = 25
+DONE_BLOCK = '█'
+EMPTY_BLOCK = '░'
+# Blocks filling 1/8 to 7/8 of a cell
+PARTIAL_BLOCKS = '▏▎▍▌▋▊▉'
+
+
+def char_width(char: str):
+    """Number of terminal columns taken by a character"""
+    if unicodedata.combining(char) or unicodedata.category(char) in ('Mn', 'Me', 'Cf'):
+        return 0
+    return 2 if unicodedata.east_asian_width(char) in ('W', 'F') else 1
+
+
+def display_width(text: str):
+    return sum(char_width(char) for char in text)
+
+
+def fit(text: str, width: int):
+    """Cut the text to the given display width and pad it with spaces up to it"""
+    used = 0
+    for index, char in enumerate(text):
+        if used + char_width(char) > width:
+            text = text[:index]
+            break
+        used += char_width(char)
+    return text + ' ' * (width - used)
+
+
+def build_bars(steps: int):
+    """Bar of every bucket, a bucket being 1/steps of a cell"""
+    bars = []
+    for bucket in range(BAR_WIDTH * steps + 1):
+        done, part = divmod(bucket, steps)
+        partial = PARTIAL_BLOCKS[part * 8 // steps - 1] if part else ''
+        bars.append(DONE_BLOCK * done + partial + EMPTY_BLOCK * (BAR_WIDTH - done - len(partial)))
+    return bars
+
+
+BARS = build_bars(1)
+FRACTIONAL_BARS = build_bars(8)
+
+
+def make_bar(percent: float, fractional=False):
+    bars = FRACTIONAL_BARS if fractional else BARS
+    steps = (len(bars) - 1) // BAR_WIDTH
+    bucket = math.floor(percent / (100 / (BAR_WIDTH * steps)))
+    return bars[min(max(bucket, 0), len(bars) - 1)]
+
+
+class TextTable:
+    """Renders rows of name, text, progress bar and percent aligned by their display width"""
+
+    def __init__(self, name_width: int, text_width: int, fractional=False):
+        self.name_width = name_width
+        self.text_width = text_width
+        self.fractional = fractional
+
+    def row(self, entry: dict):
+        text = entry['text']
+        text_padding = ' ' * (self.text_width - display_width(text))
+        return f"{fit(entry['name'], self.name_width)}{text}{text_padding}{make_bar(entry['percent'], self.fractional)}   {entry['percent']}%"
+
+    def render(self, data: list):
+        return ' \n'.join(self.row(entry) for entry in data)
@@ -0,0 +1,369 @@
+"""
+Local stand-in for the GitHub and WakaTime APIs used to load test the action
+without spending real quotas.
+
+Run it with ``python mock_server.py --repos 1000 --commits 100`` and point the
+action at it:
+
+    INPUT_GITHUB_API_URL=http://127.0.0.1:8000
+    INPUT_WAKATIME_URL=http://127.0.0.1:8000
+"""
+import argparse
+import base64
+import datetime
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+LANGUAGES = [
+    ('Python', '#3572A5'), ('JavaScript', '#f1e05a'), ('TypeScript', '#2b7489'), ('Java', '#b07219'),
+    ('Go', '#00ADD8'), ('Rust', '#dea584'), ('C++', '#f34b7d'), ('C', '#555555'), ('Kotlin', '#F18E33'),
+    ('Ruby', '#701516'), ('PHP', '#4F5D95'), ('Shell', '#89e051'), ('Swift', '#ffac45'), ('Dart', '#00B4AB'),
+]
+EDITORS = ['VS Code', 'PyCharm', 'IntelliJ IDEA', 'Vim', 'Neovim', 'Emacs', 'Sublime Text']
+OPERATING_SYSTEMS = ['Linux', 'Mac', 'Windows']
+
+
+class MockConfig:
+    """Size and behaviour knobs of the generated data set."""
+
+    def __init__(self, repos=50, commits=30, languages=len(LANGUAGES), projects=20, latency=0.0,
+                 computing_rate=0.0, rate_limit=5000, seed=0, username='octocat'):
+        self.repos = repos
+        self.commits = commits
+        self.languages = languages
+        self.projects = projects
+        self.latency = latency
+        self.computing_rate = computing_rate
+        self.rate_limit = rate_limit
+        self.seed = seed
+        self.username = username
+
+
+class MockData:
+    """Deterministic synthetic accounts, generated lazily per repository."""
+
+    def __init__(self, config: MockConfig):
+        self.config = config
+        self.user_id = 'MDQ6VXNlcjE='
+        self.languages = (LANGUAGES * (config.languages // len(LANGUAGES) + 1))[:config.languages]
+        self.languages = [(name if i < len(LANGUAGES) else f"{name} {i}", color) for i, (name, color) in enumerate(self.languages)]
+        self.readme = "# Hello\n\n<!--START_SECTION:waka-->\n<!--END_SECTION:waka-->\n"
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def _random(self, *key):
+        return random.Random(f"{self.config.seed}:{':'.join(str(k) for k in key)}")
+
+    def repo_name(self, index: int):
+        return f"repo-{index}"
+
+    def repo_index(self, name: str):
+        match = re.fullmatch(r'repo-(\d+)', name)
+        return int(match.group(1)) if match else 0
+
+    def repository(self, index: int):
+        rnd = self._random('repo', index)
+        language = self.languages[index % len(self.languages)] if self.languages else None
+        created = datetime.datetime(2015, 1, 1) + datetime.timedelta(days=rnd.randrange(3000))
+        return {
+            'object': {'history': {'totalCount': self.config.commits}},
+            'primaryLanguage': None if language is None else {'color': language[1], 'name': language[0], 'id': f"lang-{language[0]}"},
+            'stargazers': {'totalCount': rnd.randrange(100)},
+            'collaborators': {'totalCount': rnd.randrange(1, 5)},
+            'createdAt': created.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'name': self.repo_name(index),
+            'owner': {'id': self.user_id, 'login': self.config.username},
+            'nameWithOwner': f"{self.config.username}/{self.repo_name(index)}",
+            'isFork': False,
+        }
+
+    def commit(self, repo_index: int, index: int):
+        rnd = self._random('commit', repo_index, index)
+        date = datetime.datetime(2016, 1, 1) + datetime.timedelta(seconds=rnd.randrange(10 * 365 * 24 * 3600))
+        # The commit index is encoded in the sha so single commit lookups stay O(1) for huge repositories
+        sha = f"{repo_index:08x}{index:08x}" + hashlib.sha1(f"{repo_index}:{index}".encode()).hexdigest()[:24]
+        additions = rnd.randrange(500)
+        deletions = rnd.randrange(additions + 1)
+        return {
+            'sha': sha,
+            'commit': {'author': {'name': self.config.username, 'date': date.strftime('%Y-%m-%dT%H:%M:%SZ')}},
+            'stats': {'additions': additions, 'deletions': deletions, 'total': additions + deletions},
+        }
+
+    def commit_by_sha(self, repo_index: int, sha: str):
+        try:
+            index = int(sha[8:16], 16)
+        except ValueError:
+            return None
+        if index >= self.config.commits or self.commit(repo_index, index)['sha'] != sha:
+            return None
+        return self.commit(repo_index, index)
+
+    def graphql(self, query: str):
+        repos = [self.repository(i) for i in range(min(self.config.repos, 100))]
+        if 'viewer' in query:
+            return {'data': {'viewer': {'login': self.config.username, 'email': None, 'id': self.user_id}}}
+        if 'repositoriesContributedTo' in query:
+            return {'data': {'user': {'repositoriesContributedTo': {'nodes': [
+                {'isFork': False, 'name': r['name'], 'owner': {'login': r['owner']['login']}} for r in repos
+            ]}}}}
+        if 'defaultBranchRef' in query:
+            name = re.search(r'name:\s*"([^"]+)"', query).group(1)
+            index = self.repo_index(name)
+            edges = [{'node': {'committedDate': self.commit(index, i)['commit']['author']['date']}}
+                     for i in range(min(self.config.commits, 100))]
+            return {'data': {'repository': {'defaultBranchRef': {'target': {'history': {'edges': edges}}}}}}
+        if 'totalCommitContributions' in query:
+            since = re.search(r'from:\s*"([^"]+)"', query).group(1)
+            total = self._random('weekly_commits', since[:10]).randrange(0, 100)
+            return {'data': {'user': {'contributionsCollection': {'totalCommitContributions': total}}}}
+        if 'contributionsCollection' in query:
+            year = re.search(r'from:\s*"(\d{4})', query).group(1)
+            total = self._random('contributions', year).randrange(100, 3000)
+            years = list(range(datetime.datetime.utcnow().year, 2014, -1))
+            return {'data': {'user': {
+                'contributionsCollection': {'contributionYears': years},
+                'contributions': {'contributionCalendar': {'totalContributions': total}},
+            }}}
+        if 'repositories(' in query:
+            return {'data': {'user': {
+                'repositories': {'totalCount': self.config.repos, 'edges': [{'node': r} for r in repos]},
+                'location': 'Earth', 'createdAt': '2015-01-01T00:00:00Z', 'name': self.config.username,
+            }}}
+        return {'errors': [{'message': 'Unsupported query'}]}
+
+    def waka_stats(self, days=30):
+        def entries(names, key):
+            rnd = self._random('waka', days, key)
+            seconds = [rnd.randrange(60, 1200 * days) for _ in names]
+            total = sum(seconds) or 1
+            return sorted([{
+                'name': name,
+                'total_seconds': s,
+                'percent': round(s / total * 100, 2),
+                'text': f"{s // 3600} hrs {s % 3600 // 60} mins",
+            } for name, s in zip(names, seconds)], key=lambda x: x['percent'], reverse=True)
+
+        return {'data': {
+            'languages': entries([name for name, _ in self.languages], 'languages'),
+            'editors': entries(EDITORS, 'editors'),
+            'projects': entries([self.repo_name(i) for i in range(self.config.projects)], 'projects'),
+            'operating_systems': entries(OPERATING_SYSTEMS, 'os'),
+        }}
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    server_version = 'MockGitHub/1.0'
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def data(self) -> MockData:
+        return self.server.data
+
+    def send_json(self, payload, status=200, headers=None):
+        with self.data.lock:
+            self.data.requests += 1
+            exceeded = self.data.requests > self.data.config.rate_limit
+            remaining = max(self.data.config.rate_limit - self.data.requests, 0)
+        if exceeded:
+            # GitHub answers every request with 403 once the rate limit is used up
+            payload, status = {'message': 'API rate limit exceeded'}, 403
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('X-RateLimit-Limit', str(self.data.config.rate_limit))
+        self.send_header('X-RateLimit-Remaining', str(remaining))
+        self.send_header('X-RateLimit-Reset', str(int(time.time()) + 3600))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def computing(self):
+        """Imitate WakaTime answering 202 while the stats are being computed."""
+        return random.random() < self.data.config.computing_rate
+
+    def do_POST(self):
+        time.sleep(self.data.config.latency)
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        if urlparse(self.path).path.rstrip('/') in ('/graphql', '/api/graphql'):
+            self.send_json(self.data.graphql(payload.get('query', '')))
+        else:
+            self.send_json({'message': 'Not Found'}, 404)
+
+    def do_PUT(self):
+        time.sleep(self.data.config.latency)
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        path = urlparse(self.path).path
+        match = re.fullmatch(r'/repos/([^/]+)/([^/]+)/contents/(.+)', path)
+        if match is None:
+            self.send_json({'message': 'Not Found'}, 404)
+            return
+        if match.group(3).lower() == 'readme.md':
+            self.data.readme = base64.b64decode(payload.get('content', '')).decode('utf-8')
+        self.send_json({'content': self.contents(match.group(1), match.group(2), match.group(3)),
+                        'commit': {'sha': hashlib.sha1(path.encode()).hexdigest()}})
+
+    def contents(self, owner, repo, path, content=''):
+        return {
+            'type': 'file', 'encoding': 'base64', 'name': path.split('/')[-1], 'path': path,
+            'content': base64.b64encode(content.encode('utf-8')).decode('ascii'),
+            'sha': hashlib.sha1(content.encode('utf-8')).hexdigest(),
+            'url': f"{self.base_url}/repos/{owner}/{repo}/contents/{path}",
+        }
+
+    @property
+    def base_url(self):
+        return f"http://{self.headers.get('Host')}"
+
+    def do_GET(self):
+        time.sleep(self.data.config.latency)
+        url = urlparse(self.path)
+        path = url.path.rstrip('/')
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        config = self.data.config
+
+        # WakaTime
+        match = re.search(r'/users/current/stats/last_(7|30)_days$', path)
+        if match is not None:
+            if self.computing():
+                self.send_json({'data': {'is_up_to_date': False}}, 202)
+            else:
+                self.send_json(self.data.waka_stats(int(match.group(1))))
+            return
+        if path.endswith('/users/current/all_time_since_today'):
+            self.send_json({'data': {'text': '1,234 hrs 56 mins', 'total_seconds': 4445760}})
+            return
+        if path.endswith('/users/current'):
+            self.send_json({'data': {'timezone': 'Europe/Berlin', 'username': config.username}})
+            return
+
+        # GitHub REST
+        if path == '/user':
+            self.send_json({
+                'login': config.username, 'id': 1, 'type': 'User', 'hireable': True,
+                'public_repos': config.repos, 'owned_private_repos': 0, 'disk_usage': 1024 * config.repos,
+                'url': f"{self.base_url}/users/{config.username}",
+            })
+            return
+        if path == '/user/emails':
+            self.send_json([{'email': f"{config.username}@example.com", 'primary': True, 'verified': True}])
+            return
+
+        match = re.fullmatch(r'/repos/([^/]+)/([^/]+)(/.*)?', path)
+        if match is None:
+            self.send_json({'message': 'Not Found'}, 404)
+            return
+        owner, repo, rest = match.group(1), match.group(2), match.group(3) or ''
+        index = self.data.repo_index(repo)
+
+        if rest == '':
+            self.send_json({
+                'name': repo, 'full_name': f"{owner}/{repo}", 'default_branch': 'master',
+                'owner': {'login': owner}, 'url': f"{self.base_url}/repos/{owner}/{repo}",
+            })
+        elif rest == '/readme':
+            self.send_json(self.contents(owner, repo, 'README.md', self.data.readme))
+        elif rest.startswith('/contents/'):
+            self.send_json({'message': 'Not Found'}, 404)
+        elif rest == '/commits':
+            per_page = min(int(params.get('per_page', 30)), 100)
+            page = max(int(params.get('page', 1)), 1)
+            start = (page - 1) * per_page
+            commits = [self.data.commit(index, i) for i in range(start, min(start + per_page, config.commits))]
+            for commit in commits:
+                del commit['stats']
+            headers = {}
+            if start + per_page < config.commits:
+                headers['Link'] = f'<{self.base_url}{url.path}?per_page={per_page}&page={page + 1}>; rel="next"'
+            self.send_json(commits, headers=headers)
+        elif rest.startswith('/commits/'):
+            commit = self.data.commit_by_sha(index, rest[len('/commits/'):])
+            if commit is None:
+                self.send_json({'message': 'No commit found for SHA'}, 422)
+            else:
+                self.send_json(commit)
+        elif rest == '/traffic/views':
+            today = datetime.datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+            rnd = self.data._random('views', today.date())
+            views = [{
+                'timestamp': (today - datetime.timedelta(days=13 - i)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'count': rnd.randrange(50), 'uniques': rnd.randrange(10),
+            } for i in range(14)]
+            self.send_json({'count': sum(v['count'] for v in views), 'uniques': sum(v['uniques'] for v in views), 'views': views})
+        elif rest == '/traffic/popular/referrers':
+            rnd = self.data._random('referrers', datetime.datetime.utcnow().date())
+            self.send_json([{'referrer': name, 'count': rnd.randrange(1, 200), 'uniques': rnd.randrange(1, 20)}
+                            for name in ('github.com', 'google.com', 'twitter.com', 'linkedin.com')])
+        else:
+            self.send_json({'message': 'Not Found'}, 404)
+
+
+class MockServer:
+    """Threaded mock API server which can be started in the background."""
+
+    def __init__(self, config: MockConfig = None, host='127.0.0.1', port=0):
+        self.httpd = ThreadingHTTPServer((host, port), MockHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.data = MockData(config or MockConfig())
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self):
+        return self.httpd.data.requests
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--repos', type=int, default=50, help='number of repositories of the user')
+    parser.add_argument('--commits', type=int, default=30, help='number of commits per repository')
+    parser.add_argument('--languages', type=int, default=len(LANGUAGES), help='number of distinct languages')
+    parser.add_argument('--projects', type=int, default=20, help='number of WakaTime projects')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds to wait before each response')
+    parser.add_argument('--computing-rate', type=float, default=0.0, help='share of WakaTime stats requests answered with 202')
+    parser.add_argument('--rate-limit', type=int, default=5000, help='requests answered before responding with 403')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--username', default='octocat')
+    args = parser.parse_args()
+    mock_config = MockConfig(repos=args.repos, commits=args.commits, languages=args.languages, projects=args.projects,
+                             latency=args.latency, computing_rate=args.computing_rate, rate_limit=args.rate_limit,
+                             seed=args.seed, username=args.username)
+    server = MockServer(mock_config, args.host, args.port)
+    print(f"Mock GitHub/WakaTime server listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
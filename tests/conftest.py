@@ -0,0 +1,62 @@
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# main reads its inputs when imported, every section starts disabled
+for flag in ['SHOW_TIMEZONE', 'SHOW_PROJECTS', 'SHOW_EDITORS', 'SHOW_OS', 'SHOW_COMMIT', 'SHOW_LANGUAGE', 'SHOW_LINES_OF_CODE',
+             'SHOW_DAYS_OF_WEEK', 'SHOW_LANGUAGE_PER_REPO', 'SHOW_LOC_CHART', 'SHOW_PROFILE_VIEWS', 'SHOW_SHORT_INFO',
+             'SHOW_UPDATED_DATE', 'SHOW_TOTAL_CODE_TIME', 'SHOW_HISTORY', 'SHOW_PROFILE_REFERRERS', 'FRACTIONAL_BARS',
+             'COMMIT_BY_ME']:
+    os.environ.setdefault('INPUT_' + flag, 'False')
+os.environ.setdefault('INPUT_LOCALE', 'en')
+os.environ.setdefault('INPUT_WAKATIME_API_KEY', 'waka-key')
+
+import main  # noqa: E402
+from mock_server import MockConfig, MockServer  # noqa: E402
+
+with open(os.path.join(ROOT, 'translation.json'), encoding='utf-8') as translation_file:
+    TRANSLATIONS = json.load(translation_file)
+
+
+def locale_translation(locale):
+    return {**TRANSLATIONS['en'], **TRANSLATIONS[locale]}
+
+
+@pytest.fixture(autouse=True)
+def no_history(monkeypatch):
+    monkeypatch.setattr(main, 'history', None)
+
+
+@pytest.fixture
+def translate(monkeypatch):
+    monkeypatch.setattr(main, 'translate', locale_translation('en'), raising=False)
+
+
+@pytest.fixture
+def mock_api(monkeypatch, translate):
+    """Start a mock server for the given MockConfig and point main at it as an authenticated user"""
+    servers = []
+
+    def start(config: MockConfig):
+        server = MockServer(config).start()
+        servers.append(server)
+        monkeypatch.setattr(main, 'github_api_url', server.url)
+        monkeypatch.setattr(main, 'waka_url', server.url)
+        monkeypatch.setattr(main, 'headers', {'Authorization': 'Bearer token'}, raising=False)
+        monkeypatch.setattr(main, 'username', config.username, raising=False)
+        monkeypatch.setattr(main, 'user_id', server.httpd.data.user_id, raising=False)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def enable(monkeypatch, *flags):
+    for flag in flags:
+        monkeypatch.setattr(main, flag, 'True')
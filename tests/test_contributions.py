@@ -0,0 +1,92 @@
+import datetime
+import re
+
+import pytest
+
+import main
+from conftest import enable
+from history import StatsHistory
+from mock_server import MockConfig
+
+THIS_YEAR = datetime.datetime.utcnow().year
+
+
+def fail_years(monkeypatch, years):
+    """Make the contributions query of the given years answer with a GraphQL error payload"""
+    run_query = main.run_query
+
+    def failing_run_query(query):
+        match = re.search(r'from: "(\d{4})', query)
+        if match is not None and int(match.group(1)) in years:
+            return {'data': None, 'errors': [{'message': 'Something went wrong'}]}
+        return run_query(query)
+
+    monkeypatch.setattr(main, 'run_query', failing_run_query)
+
+
+@pytest.fixture
+def history(monkeypatch, tmp_path):
+    store = StatsHistory(str(tmp_path / 'stats.sqlite'))
+    monkeypatch.setattr(main, 'history', store)
+    return store
+
+
+def test_current_year_only_without_history(mock_api):
+    server = mock_api(MockConfig())
+
+    contributions, complete = main.get_contributions()
+
+    assert list(contributions) == [THIS_YEAR]
+    assert not complete
+    assert server.requests == 1
+
+
+def test_past_years_are_cached(mock_api, history):
+    server = mock_api(MockConfig())
+
+    contributions, complete = main.get_contributions()
+    assert complete
+    assert sorted(contributions) == list(range(2015, THIS_YEAR + 1))
+    assert server.requests == len(contributions)
+
+    assert main.get_contributions() == (contributions, True)
+    assert server.requests == len(contributions) + 1
+
+
+def test_failing_past_year_is_fetched_again(monkeypatch, mock_api, history):
+    mock_api(MockConfig())
+    fail_years(monkeypatch, [2018])
+
+    contributions, complete = main.get_contributions()
+    assert 2018 not in contributions and 2018 not in history.contributions()
+    assert not complete
+
+    monkeypatch.undo()
+    server = mock_api(MockConfig())
+    monkeypatch.setattr(main, 'history', history)
+    contributions, complete = main.get_contributions()
+    assert complete and 2018 in contributions
+    # The current year and the year which failed before
+    assert server.requests == 2
+
+
+def test_short_info_without_contributions(monkeypatch, mock_api):
+    server = mock_api(MockConfig())
+    enable(monkeypatch, 'show_short_info')
+    fail_years(monkeypatch, [THIS_YEAR])
+
+    short_info = main.get_stats(main.Github('token', base_url=server.url))
+
+    assert 'Contributions' not in short_info
+    assert 'Used in GitHub' in short_info
+
+
+def test_short_info_leaves_out_incomplete_total(monkeypatch, mock_api, history):
+    server = mock_api(MockConfig())
+    enable(monkeypatch, 'show_short_info')
+    fail_years(monkeypatch, [2016])
+
+    short_info = main.get_stats(main.Github('token', base_url=server.url))
+
+    assert f"Contributions in the Year {THIS_YEAR}" in short_info
+    assert 'Contributions since' not in short_info
@@ -0,0 +1,164 @@
+import base64
+import datetime
+
+import pytest
+from github import GithubException, UnknownObjectException
+
+import main
+from history import HISTORY_PATH, StatsHistory
+from mock_server import MockConfig, MockData
+
+
+class Contents:
+    def __init__(self, data: bytes, sha='abc'):
+        self.encoding = 'base64'
+        self.content = base64.b64encode(data).decode('ascii')
+        self.decoded_content = data
+        self.sha = sha
+        self.path = HISTORY_PATH
+
+
+class Repo:
+    """Profile repository holding at most the history file, get_contents fails with the given error"""
+
+    def __init__(self, contents=None, error=None):
+        self.contents = contents
+        self.error = error
+        self.created = []
+        self.updated = []
+
+    def get_contents(self, path):
+        if self.error is not None:
+            raise self.error
+        if self.contents is None:
+            raise UnknownObjectException(404, {'message': 'Not Found'}, {})
+        return self.contents
+
+    def create_file(self, path, message, content, committer=None):
+        self.created.append((path, content))
+
+    def update_file(self, path, message, content, sha, committer=None):
+        self.updated.append((path, content, sha))
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    return str(tmp_path / 'stats.sqlite')
+
+
+def test_pull_without_history_creates_store(store_path):
+    repo = Repo()
+    history = StatsHistory.pull(repo, store_path)
+    history.record_commits(datetime.date.today(), 3)
+    history.push(repo)
+
+    assert [path for path, _ in repo.created] == [HISTORY_PATH]
+    assert repo.updated == []
+
+
+def test_pull_updates_existing_history(store_path, tmp_path):
+    previous = StatsHistory(str(tmp_path / 'previous.sqlite'))
+    previous.record_commits(datetime.date.today(), 7)
+    previous.connection.close()
+    with open(tmp_path / 'previous.sqlite', 'rb') as previous_file:
+        repo = Repo(Contents(previous_file.read(), sha='old'))
+
+    history = StatsHistory.pull(repo, store_path)
+    assert history.connection.execute('SELECT count FROM commits').fetchone() == (7,)
+    history.push(repo)
+
+    assert repo.created == []
+    assert [(path, sha) for path, _, sha in repo.updated] == [(HISTORY_PATH, 'old')]
+
+
+@pytest.mark.parametrize('error', [
+    GithubException(403, {'message': 'API rate limit exceeded'}, {}),
+    GithubException(502, {'message': 'Server Error'}, {}),
+    AssertionError('Unsupported encoding: none'),
+])
+def test_pull_failure_never_overwrites_history(store_path, error):
+    repo = Repo(Contents(b'history'), error=error)
+    history = StatsHistory.pull(repo, store_path)
+    history.record_commits(datetime.date.today(), 3)
+    history.push(repo)
+
+    assert repo.created == []
+    assert repo.updated == []
+
+
+def record_languages(history, date, seconds, table='waka_weekly'):
+    history.record_waka(date, {'data': {'languages': [{'name': 'Python', 'total_seconds': seconds}]}}, table)
+
+
+@pytest.mark.parametrize('days_back', [7, 8, 10])
+def test_weekly_delta_compares_with_last_week(store_path, days_back):
+    today = datetime.date(2026, 10, 19)
+    history = StatsHistory(store_path)
+    record_languages(history, today - datetime.timedelta(days=days_back), 3600)
+    record_languages(history, today, 5400)
+
+    assert history.weekly_delta('languages', today) == [{'name': 'Python', 'seconds': 5400, 'delta': 1800}]
+
+
+@pytest.mark.parametrize('days_back', [3, 6, 11, 200])
+def test_weekly_delta_without_snapshot_of_last_week(store_path, days_back):
+    today = datetime.date(2026, 10, 19)
+    history = StatsHistory(store_path)
+    record_languages(history, today - datetime.timedelta(days=days_back), 3600)
+    record_languages(history, today, 5400)
+
+    assert history.weekly_delta('languages', today) is None
+
+
+def test_weekly_delta_ignores_30_days_totals(store_path):
+    today = datetime.date(2026, 10, 19)
+    history = StatsHistory(store_path)
+    record_languages(history, today - datetime.timedelta(days=7), 3600, 'waka')
+    record_languages(history, today, 5400, 'waka')
+
+    assert history.weekly_delta('languages', today) is None
+
+
+def test_weekly_delta_without_current_snapshot(store_path):
+    today = datetime.date(2026, 10, 19)
+    history = StatsHistory(store_path)
+    record_languages(history, today - datetime.timedelta(days=14), 3600)
+    record_languages(history, today - datetime.timedelta(days=7), 5400)
+
+    assert history.weekly_delta('languages', today) is None
+
+
+def test_history_section_counts_weekly_commits(monkeypatch, mock_api, store_path):
+    server = mock_api(MockConfig(repos=1000, commits=100000))
+    monkeypatch.setattr(main, 'show_history', 'True')
+    history = StatsHistory(store_path)
+    monkeypatch.setattr(main, 'history', history)
+    last_week = datetime.date.today() - datetime.timedelta(days=7)
+    record_languages(history, last_week, 3600)
+    history.record_commits(last_week, 10)
+
+    stats = main.get_stats(None)
+
+    # The languages are compared using the stats of the last 7 days
+    python = next(entry for entry in MockData(MockConfig()).waka_stats(7)['data']['languages'] if entry['name'] == 'Python')
+    language_delta = history.weekly_delta('languages', datetime.date.today())
+    assert {'name': 'Python', 'seconds': python['total_seconds'], 'delta': python['total_seconds'] - 3600} in language_delta
+    commits = history.connection.execute('SELECT count FROM commits WHERE date = ?', (datetime.date.today().isoformat(),)).fetchone()[0]
+    delta = commits - 10
+    assert f"Commits: {commits} ({'+' if delta >= 0 else ''}{delta})" in stats
+    # WakaTime stats of the last 30 and 7 days and the commits of the last week
+    assert server.requests == 3
+
+
+def test_referrers_pruned_to_summed_up_snapshots(store_path):
+    history = StatsHistory(store_path)
+    first_day = datetime.date(2026, 1, 1)
+    for day in range(40):
+        history.record_referrers(first_day + datetime.timedelta(days=day), [{'referrer': 'github.com', 'count': 14, 'uniques': 2}])
+    top_referrers = history.top_referrers()
+
+    history.prune()
+
+    dates = [row[0] for row in history.connection.execute('SELECT DISTINCT date FROM traffic_referrers ORDER BY date')]
+    assert dates == ['2026-01-01', '2026-01-15', '2026-01-29']
+    assert history.top_referrers() == top_referrers == [('github.com', 42)]
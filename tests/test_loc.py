@@ -0,0 +1,66 @@
+import copy
+import os
+import random
+
+import pytest
+
+from loc import LocCounter
+
+LANGUAGES = ['Python', 'Go', 'Rust', 'C', 'Kotlin']
+
+
+def commits(count=2000):
+    rnd = random.Random(0)
+    return [(rnd.randrange(2016, 2027), rnd.randrange(1, 5), rnd.choice(LANGUAGES), rnd.randrange(1, 500)) for _ in range(count)]
+
+
+def fold(rows):
+    yearly_data = {}
+    for year, quarter, language, lines in rows:
+        quarters = yearly_data.setdefault(year, {}).setdefault(quarter, {})
+        quarters[language] = quarters.get(language, 0) + lines
+    return yearly_data
+
+
+def test_counter_spills_languages_to_disk():
+    rows = commits()
+    counter = LocCounter(max_languages=2)
+    for row in rows:
+        counter.add(*row)
+
+    # Only the first two languages are kept in memory, every commit of the others is added up on disk
+    assert counter.spill is not None and os.path.isdir(counter.spill_dir)
+    assert counter.to_yearly_data() == fold(rows)
+    assert counter.total() == sum(lines for _, _, _, lines in rows)
+    assert sorted(counter.items()) == sorted((year, quarter, language, lines) for year, quarters in fold(rows).items()
+                                             for quarter, languages in quarters.items() for language, lines in languages.items())
+
+    spill_dir = counter.spill_dir
+    counter.close()
+    assert not os.path.exists(spill_dir)
+
+
+def test_counter_in_memory_only():
+    rows = [row for row in commits() if row[2] in LANGUAGES[:2]]
+    counter = LocCounter(max_languages=2)
+    for row in rows:
+        counter.add(*row)
+
+    assert counter.spill is None
+    assert counter.to_yearly_data() == fold(rows)
+    counter.close()
+
+
+def test_bar_graph_keeps_yearly_data(monkeypatch):
+    alt = pytest.importorskip('altair')
+    pytest.importorskip('pandas')
+    from make_bar_graph import BarGraph
+    saved = []
+    monkeypatch.setattr(alt.Chart, 'save', lambda chart, path: saved.append(chart))
+    yearly_data = fold(commits())
+    original = copy.deepcopy(yearly_data)
+
+    BarGraph(yearly_data).build_graph()
+
+    assert yearly_data == original
+    assert len(saved) == 1
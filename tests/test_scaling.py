@@ -0,0 +1,113 @@
+import re
+
+import loc
+import main
+from conftest import enable
+from mock_server import MockConfig, MockData
+
+
+def commit_counts(text):
+    return [int(count) for count in re.findall(r'(\d+) commits', text)]
+
+
+def test_generate_commit_list_huge_account(monkeypatch, mock_api):
+    server = mock_api(MockConfig(repos=1000, commits=100000))
+    enable(monkeypatch, 'show_days_of_week')
+
+    text = main.generate_commit_list(tz='UTC')
+
+    # One query for the repositories and one per repository, both capped at 100 by the queries
+    assert server.requests == 1 + 100
+    counts = commit_counts(text)
+    assert len(counts) == 4 + 7
+    assert sum(counts[:4]) == sum(counts[4:]) == 100 * 100
+
+
+def test_calculate_loc_walks_every_page(monkeypatch, mock_api):
+    config = MockConfig(repos=10, commits=250, rate_limit=100000)
+    server = mock_api(config)
+    monkeypatch.setattr(loc.time, 'sleep', lambda seconds: None)
+    repository_list = main.get_repository_list(None)
+
+    yearly_data = loc.LinesOfCode(main.user_id, main.username, 'token', repository_list, [], server.url).calculateLoc()
+
+    # The repository list, 3 pages of commits and every single commit of each repository
+    assert server.requests == 1 + config.repos * (3 + config.commits)
+    data = MockData(config)
+    expected = sum(commit['stats']['additions'] - commit['stats']['deletions']
+                   for commit in (data.commit(repo, index) for repo in range(config.repos) for index in range(config.commits)))
+    assert sum(lines for year in yearly_data.values() for quarter in year.values() for lines in quarter.values()) == expected
+    assert {language for year in yearly_data.values() for quarter in year.values() for language in quarter} == \
+           {name for name, _ in data.languages[:config.repos]}
+
+
+def test_get_stats_huge_account(monkeypatch, mock_api):
+    server = mock_api(MockConfig(repos=1000, commits=100000))
+    enable(monkeypatch, 'showCommit', 'showLanguage', 'showEditors', 'showProjects', 'showOs', 'showTimeZone',
+           'show_days_of_week', 'showLanguagePerRepo', 'show_profile_view', 'showLocChart')
+
+    stats = main.get_stats(main.Github('token', base_url=server.url))
+
+    # Profile views, 2 WakaTime requests, 101 for the commit list, the repository list and the default branch
+    assert server.requests == 1 + 2 + 101 + 1 + 1
+    assert '![Profile Views]' in stats
+    assert sum(commit_counts(stats)) == 2 * 100 * 100
+    assert stats.count('```text') == 3
+    assert '100 repos' not in stats and '8 repos' in stats
+    assert 'charts/bar_graph.png' in stats
+
+
+def test_get_stats_nothing_enabled(mock_api):
+    server = mock_api(MockConfig(repos=1000, commits=100000))
+
+    assert main.get_stats(None) == ''
+    assert server.requests == 0
+
+
+def test_calculate_loc_stops_at_rate_limit(monkeypatch, mock_api):
+    config = MockConfig(repos=10, commits=250, rate_limit=600)
+    server = mock_api(config)
+    monkeypatch.setattr(loc.time, 'sleep', lambda seconds: None)
+    repository_list = main.get_repository_list(None)
+
+    yearly_data = loc.LinesOfCode(main.user_id, main.username, 'token', repository_list, [], server.url).calculateLoc()
+
+    # The request hitting the limit is the last one
+    assert server.requests == config.rate_limit + 1
+    # Every repository got its first turn of commits before the limit was reached
+    data = MockData(config)
+    assert {language for year in yearly_data.values() for quarter in year.values() for language in quarter} == \
+           {name for name, _ in data.languages[:config.repos]}
+    first_turns = sum(commit['stats']['additions'] - commit['stats']['deletions']
+                      for commit in (data.commit(repo, index) for repo in range(config.repos) for index in range(loc.COMMITS_PER_ROUND)))
+    assert sum(lines for year in yearly_data.values() for quarter in year.values() for lines in quarter.values()) > first_turns
+
+
+def test_get_stats_wakatime_only(monkeypatch, mock_api):
+    server = mock_api(MockConfig(repos=1000, commits=100000))
+    enable(monkeypatch, 'showLanguage', 'showEditors')
+
+    stats = main.get_stats(None)
+
+    # Only the WakaTime stats, neither the current user nor anything from GitHub
+    assert server.requests == 1
+    assert 'Languages:' in stats and 'Editors:' in stats
+
+
+def test_get_stats_wakatime_timezone(monkeypatch, mock_api):
+    server = mock_api(MockConfig())
+    enable(monkeypatch, 'showLanguage', 'showTimeZone')
+
+    stats = main.get_stats(None)
+
+    assert server.requests == 2
+    assert 'Time Zone: Europe/Berlin' in stats
+
+
+def test_get_stats_wakatime_computing(monkeypatch, mock_api):
+    server = mock_api(MockConfig(computing_rate=1.0))
+    enable(monkeypatch, 'showCommit', 'showLanguage', 'showTimeZone')
+
+    # Nothing to show while WakaTime is still computing the stats
+    assert main.get_stats(None) == ''
+    assert server.requests == 2
@@ -0,0 +1,78 @@
+import math
+
+import pytest
+
+import main
+from conftest import TRANSLATIONS
+from make_text_table import BAR_WIDTH, display_width, fit, make_bar
+
+
+def make_graph(percent: float):
+    """The progress graph as it was drawn before the text table"""
+    done_block = '█'
+    empty_block = '░'
+    return f"{done_block * math.floor(percent / 4)}{empty_block * (25 - math.floor(percent / 4))}"
+
+
+def locale_rows(locale):
+    return [{'name': text, 'text': f"{index} commits", 'percent': round(index * 100 / 37, 2) % 100}
+            for index, text in enumerate(TRANSLATIONS[locale].values())]
+
+
+def bar_columns(table, rows):
+    """Display columns at which the text and the bar of every row start"""
+    columns = []
+    for line, row in zip(table.split(' \n'), rows):
+        bar_start = line.index(make_bar(row['percent'], main.fractional_bars.lower() in main.truthy))
+        text_start = line.index(row['text'], 0, bar_start)
+        columns.append((display_width(line[:text_start]), display_width(line[:bar_start])))
+    return set(columns)
+
+
+@pytest.mark.parametrize('locale', TRANSLATIONS.keys())
+def test_make_list_aligned(locale):
+    rows = locale_rows(locale)
+    assert bar_columns(main.make_list(rows, limit=len(rows)), rows) == {(25, 25 + 20)}
+
+
+@pytest.mark.parametrize('locale', TRANSLATIONS.keys())
+def test_make_commit_list_aligned(locale):
+    rows = locale_rows(locale)
+    for start in range(0, len(rows), 7):
+        assert bar_columns(main.make_commit_list(rows[start:]), rows[start:start + 7]) == {(13, 13 + 15)}
+
+
+@pytest.mark.parametrize('locale', TRANSLATIONS.keys())
+def test_fractional_bars_aligned(monkeypatch, locale):
+    monkeypatch.setattr(main, 'fractional_bars', 'True')
+    rows = locale_rows(locale)
+    assert bar_columns(main.make_list(rows, limit=len(rows)), rows) == {(25, 25 + 20)}
+
+
+def test_make_bar_matches_make_graph():
+    for hundredth in range(0, 100 * 100 + 1):
+        percent = hundredth / 100
+        assert make_bar(percent) == make_graph(percent), percent
+
+
+def test_fractional_bar():
+    assert make_bar(0, fractional=True) == '░' * BAR_WIDTH
+    assert make_bar(100, fractional=True) == '█' * BAR_WIDTH
+    assert make_bar(2, fractional=True) == '▌' + '░' * (BAR_WIDTH - 1)
+    assert make_bar(37.3, fractional=True) == '█' * 9 + '▎' + '░' * 15
+    for hundredth in range(0, 100 * 100 + 1):
+        assert display_width(make_bar(hundredth / 100, fractional=True)) == BAR_WIDTH
+
+
+@pytest.mark.parametrize('text, width, expected', [
+    ('Python', 8, 'Python  '),
+    ('JavaScript', 4, 'Java'),
+    ('星期一', 6, '星期一'),
+    ('星期一', 5, '星期 '),
+    ('Caf\u00e9', 5, 'Caf\u00e9 '),
+    ('Cafe\u0301', 5, 'Cafe\u0301 '),
+    ('🐤 Early', 4, '🐤 E'),
+])
+def test_fit(text, width, expected):
+    assert fit(text, width) == expected
+    assert display_width(fit(text, width)) == width